@@ -3,19 +3,7 @@
 Quick fix for missing numpy and other dependencies
 """
 
-import subprocess
-import sys
-
-def install_package(package):
-    """Install a package using pip"""
-    try:
-        print(f"Installing {package}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-        print(f"✅ {package} installed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to install {package}: {e}")
-        return False
+from install_dependencies import install_packages, needs_install
 
 def main():
     """Install missing dependencies"""
@@ -30,12 +18,13 @@ def main():
         "transformers>=4.20.0"
     ]
     
-    print("📦 Installing critical packages...")
-    failed = []
-    
-    for package in critical_packages:
-        if not install_package(package):
-            failed.append(package)
+    critical_packages = [package for package in critical_packages if needs_install(package)]
+    if critical_packages:
+        print("📦 Installing critical packages...")
+        failed = install_packages(critical_packages)
+    else:
+        print("✅ All critical packages are already installed")
+        failed = []
     
     if failed:
         print(f"\n⚠️  Failed to install {len(failed)} packages:")
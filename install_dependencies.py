@@ -6,15 +6,56 @@ Install dependencies for Virtual SME with Groq LLM and HuggingFace embeddings
 import subprocess
 import sys
 import os
+from importlib import metadata
+
+try:
+    from packaging.requirements import Requirement
+except ImportError:
+    Requirement = None
+
+PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--prefer-binary", "--no-input"]
 
 def install_package(package):
     """Install a package using pip"""
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        subprocess.check_call([*PIP_INSTALL, package])
         return True
     except subprocess.CalledProcessError:
         return False
 
+def needs_install(requirement):
+    """Check whether a requirement is missing or not satisfied by the installed version"""
+    if Requirement is None:
+        return True
+    req = Requirement(requirement)
+    # Installed extras are not recorded in package metadata, so let pip decide
+    if req.extras:
+        return True
+    try:
+        installed_version = metadata.version(req.name)
+    except metadata.PackageNotFoundError:
+        return True
+    return not req.specifier.contains(installed_version, prereleases=True)
+
+def install_packages(packages):
+    """Install all packages in one pip run, returning the ones that failed"""
+    try:
+        subprocess.check_call([*PIP_INSTALL, *packages])
+        return []
+    except subprocess.CalledProcessError:
+        pass
+    
+    # Fall back to one package at a time to find out which ones failed
+    failed_packages = []
+    for package in packages:
+        print(f"Installing {package}...")
+        if install_package(package):
+            print(f"✅ {package} installed successfully")
+        else:
+            print(f"❌ Failed to install {package}")
+            failed_packages.append(package)
+    return failed_packages
+
 def main():
     """Install all required dependencies"""
     print("🔧 Installing Virtual SME Dependencies")
@@ -37,16 +78,13 @@ def main():
         "pydantic>=2.0.0"
     ]
     
-    print("📦 Installing packages...")
-    failed_packages = []
-    
-    for package in packages:
-        print(f"Installing {package}...")
-        if install_package(package):
-            print(f"✅ {package} installed successfully")
-        else:
-            print(f"❌ Failed to install {package}")
-            failed_packages.append(package)
+    packages = [package for package in packages if needs_install(package)]
+    if packages:
+        print("📦 Installing packages...")
+        failed_packages = install_packages(packages)
+    else:
+        print("✅ All packages are already installed")
+        failed_packages = []
     
     if failed_packages:
         print(f"\n⚠️  Failed to install {len(failed_packages)} packages:")
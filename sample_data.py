@@ -0,0 +1,132 @@
+"""
+Sample knowledge documents used to seed the Virtual SME knowledge base
+"""
+
+SAMPLE_DOCS = [
+    {
+        "title": "Distribution Finance Overview",
+        "content": """
+            Distribution Finance is a specialized banking service that provides financing solutions for supply chain and distribution networks. 
+            
+            Key components include:
+            - Supply chain financing: Working capital solutions for suppliers and distributors
+            - Inventory financing: Credit facilities secured by inventory
+            - Trade credit insurance: Protection against non-payment
+            - Distribution network financing: Support for channel partners
+            
+            Benefits:
+            - Improved cash flow for all parties in the supply chain
+            - Reduced payment delays
+            - Enhanced supplier relationships
+            - Risk mitigation through insurance products
+            """,
+        "domain": "distribution_finance",
+        "source": "Bank Internal Documentation"
+    },
+    {
+        "title": "Channel Finance Best Practices",
+        "content": """
+            Channel Finance enables banks to provide financing to channel partners, dealers, and franchisees.
+            
+            Key features:
+            - Dealer financing programs
+            - Franchise financing solutions
+            - Channel credit programs
+            - Partner relationship management
+            
+            Risk management considerations:
+            - Credit assessment of channel partners
+            - Collateral management
+            - Monitoring of channel performance
+            - Default risk mitigation strategies
+            """,
+        "domain": "channel_finance",
+        "source": "Channel Finance Manual"
+    },
+    {
+        "title": "Global Trade Finance Fundamentals",
+        "content": """
+            Global Trade Finance facilitates international trade through various financial instruments.
+            
+            Primary instruments:
+            - Letters of Credit (LC): Payment guarantees for international transactions
+            - Documentary Collections: Trade finance with document control
+            - Trade guarantees: Performance and payment guarantees
+            - Export/Import financing: Working capital for international trade
+            
+            Regulatory considerations:
+            - International trade regulations
+            - Sanctions compliance
+            - Anti-money laundering (AML) requirements
+            - Know Your Customer (KYC) procedures
+            """,
+        "domain": "global_trade_finance",
+        "source": "Global Trade Finance Handbook"
+    },
+    {
+        "title": "Risk Management Framework",
+        "content": """
+            Comprehensive risk management is essential for banking operations.
+            
+            Risk categories:
+            - Credit risk: Default risk on loans and advances
+            - Market risk: Interest rate, currency, and commodity price risks
+            - Operational risk: Internal processes, systems, and external events
+            - Liquidity risk: Ability to meet financial obligations
+            
+            Risk mitigation strategies:
+            - Diversification of portfolio
+            - Collateral management
+            - Stress testing
+            - Regular risk assessments
+            """,
+        "domain": "risk_management",
+        "source": "Risk Management Policy"
+    },
+    {
+        "title": "Banking Compliance Requirements",
+        "content": """
+            Banking compliance ensures adherence to regulatory requirements and industry standards.
+            
+            Key compliance areas:
+            - Anti-Money Laundering (AML): Detection and prevention of money laundering
+            - Know Your Customer (KYC): Customer identification and verification
+            - Basel III: Capital adequacy and liquidity requirements
+            - GDPR: Data protection and privacy regulations
+            
+            Compliance monitoring:
+            - Regular audits and assessments
+            - Automated monitoring systems
+            - Staff training programs
+            - Regulatory reporting
+            """,
+        "domain": "compliance",
+        "source": "Compliance Manual"
+    },
+    {
+        "title": "Customer Service Excellence",
+        "content": """
+            Exceptional customer service is crucial for banking success.
+            
+            Service principles:
+            - Customer-centric approach
+            - Personalized solutions
+            - Proactive communication
+            - Continuous improvement
+            
+            Digital transformation:
+            - Online banking platforms
+            - Mobile applications
+            - AI-powered chatbots
+            - Omnichannel experience
+            
+            Service metrics:
+            - Customer satisfaction scores
+            - Response times
+            - Resolution rates
+            - Net Promoter Score (NPS)
+            """,
+        "domain": "customer_service",
+        "source": "Customer Service Standards"
+    }
+]
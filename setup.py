@@ -8,16 +8,16 @@ import sys
 import subprocess
 from pathlib import Path
 
-def run_command(command, description):
-    """Run a command and handle errors"""
+def run_command(argv, description):
+    """Run a command (given as an argument list) and handle errors"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        # Output is streamed straight to the terminal rather than buffered
+        subprocess.run(argv, check=True)
         print(f"✅ {description} completed successfully")
         return True
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         print(f"❌ {description} failed: {e}")
-        print(f"Error output: {e.stderr}")
         return False
 
 def create_env_file():
@@ -53,166 +53,45 @@ CHROMA_PERSIST_DIRECTORY=./chroma_db
         print("ℹ️  .env file already exists")
 
 def create_sample_data():
-    """Create sample knowledge documents for testing"""
-    sample_docs = [
-        {
-            "title": "Distribution Finance Overview",
-            "content": """
-            Distribution Finance is a specialized banking service that provides financing solutions for supply chain and distribution networks. 
-            
-            Key components include:
-            - Supply chain financing: Working capital solutions for suppliers and distributors
-            - Inventory financing: Credit facilities secured by inventory
-            - Trade credit insurance: Protection against non-payment
-            - Distribution network financing: Support for channel partners
-            
-            Benefits:
-            - Improved cash flow for all parties in the supply chain
-            - Reduced payment delays
-            - Enhanced supplier relationships
-            - Risk mitigation through insurance products
-            """,
-            "domain": "distribution_finance",
-            "source": "Bank Internal Documentation"
-        },
-        {
-            "title": "Channel Finance Best Practices",
-            "content": """
-            Channel Finance enables banks to provide financing to channel partners, dealers, and franchisees.
-            
-            Key features:
-            - Dealer financing programs
-            - Franchise financing solutions
-            - Channel credit programs
-            - Partner relationship management
-            
-            Risk management considerations:
-            - Credit assessment of channel partners
-            - Collateral management
-            - Monitoring of channel performance
-            - Default risk mitigation strategies
-            """,
-            "domain": "channel_finance",
-            "source": "Channel Finance Manual"
-        },
-        {
-            "title": "Global Trade Finance Fundamentals",
-            "content": """
-            Global Trade Finance facilitates international trade through various financial instruments.
-            
-            Primary instruments:
-            - Letters of Credit (LC): Payment guarantees for international transactions
-            - Documentary Collections: Trade finance with document control
-            - Trade guarantees: Performance and payment guarantees
-            - Export/Import financing: Working capital for international trade
-            
-            Regulatory considerations:
-            - International trade regulations
-            - Sanctions compliance
-            - Anti-money laundering (AML) requirements
-            - Know Your Customer (KYC) procedures
-            """,
-            "domain": "global_trade_finance",
-            "source": "Global Trade Finance Handbook"
-        },
-        {
-            "title": "Risk Management Framework",
-            "content": """
-            Comprehensive risk management is essential for banking operations.
-            
-            Risk categories:
-            - Credit risk: Default risk on loans and advances
-            - Market risk: Interest rate, currency, and commodity price risks
-            - Operational risk: Internal processes, systems, and external events
-            - Liquidity risk: Ability to meet financial obligations
-            
-            Risk mitigation strategies:
-            - Diversification of portfolio
-            - Collateral management
-            - Stress testing
-            - Regular risk assessments
-            """,
-            "domain": "risk_management",
-            "source": "Risk Management Policy"
-        },
-        {
-            "title": "Banking Compliance Requirements",
-            "content": """
-            Banking compliance ensures adherence to regulatory requirements and industry standards.
-            
-            Key compliance areas:
-            - Anti-Money Laundering (AML): Detection and prevention of money laundering
-            - Know Your Customer (KYC): Customer identification and verification
-            - Basel III: Capital adequacy and liquidity requirements
-            - GDPR: Data protection and privacy regulations
-            
-            Compliance monitoring:
-            - Regular audits and assessments
-            - Automated monitoring systems
-            - Staff training programs
-            - Regulatory reporting
-            """,
-            "domain": "compliance",
-            "source": "Compliance Manual"
-        },
-        {
-            "title": "Customer Service Excellence",
-            "content": """
-            Exceptional customer service is crucial for banking success.
-            
-            Service principles:
-            - Customer-centric approach
-            - Personalized solutions
-            - Proactive communication
-            - Continuous improvement
-            
-            Digital transformation:
-            - Online banking platforms
-            - Mobile applications
-            - AI-powered chatbots
-            - Omnichannel experience
-            
-            Service metrics:
-            - Customer satisfaction scores
-            - Response times
-            - Resolution rates
-            - Net Promoter Score (NPS)
-            """,
-            "domain": "customer_service",
-            "source": "Customer Service Standards"
-        }
-    ]
-    
-    # Create a script to add sample data
+    """Create the script that loads the sample knowledge documents"""
+    # The documents themselves live in sample_data.py; only the loader is generated
     sample_data_script = """
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from virtual_sme_solution import VirtualSMESystem, KnowledgeDocument, BankingDomain
-from datetime import datetime
+# Skip HF transformers advisory warning formatting
+os.environ.setdefault("TRANSFORMERS_NO_ADVISORY_WARNINGS", "1")
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+from sample_data import SAMPLE_DOCS
+import time
 
 def add_sample_data():
-    sme = VirtualSMESystem()
+    # Imported here so importing this module does not load torch/chromadb/langchain
+    from virtual_sme_solution import VirtualSMESystem, KnowledgeDocument, BankingDomain
+    from datetime import datetime
     
-    sample_docs = """ + str(sample_docs) + """
+    sme = VirtualSMESystem()
     
-    for doc in sample_docs:
-        knowledge_doc = KnowledgeDocument(
-            id=f"sample_{doc['domain']}_{datetime.utcnow().timestamp()}",
+    ts = time.time_ns()
+    now = datetime.utcnow()
+    knowledge_docs = [
+        KnowledgeDocument(
+            id=f"sample_{doc['domain']}_{ts}_{i}",
             title=doc['title'],
             content=doc['content'],
             domain=BankingDomain(doc['domain']),
             source=doc['source'],
-            upload_date=datetime.utcnow(),
+            upload_date=now,
             metadata={"type": "sample", "category": "training"}
         )
-        
-        success = sme.add_knowledge_document(knowledge_doc)
-        if success:
-            print(f"✅ Added: {doc['title']}")
-        else:
-            print(f"❌ Failed to add: {doc['title']}")
+        for i, doc in enumerate(SAMPLE_DOCS)
+    ]
+    
+    success = sme.add_knowledge_documents(knowledge_docs)
+    status = "✅ Added" if success else "❌ Failed to add"
+    sys.stdout.write("".join(f"{status}: {doc['title']}\\n" for doc in SAMPLE_DOCS))
 
 if __name__ == "__main__":
     add_sample_data()
@@ -236,21 +115,22 @@ def main():
     print(f"✅ Python version: {sys.version}")
     
     # Create virtual environment
-    if not run_command("python -m venv venv", "Creating virtual environment"):
+    if not run_command([sys.executable, "-m", "venv", "venv"], "Creating virtual environment"):
         sys.exit(1)
     
     # Activate virtual environment and install dependencies
     if os.name == 'nt':  # Windows
         activate_cmd = "venv\\Scripts\\activate"
-        pip_cmd = "venv\\Scripts\\pip"
+        pip_cmd = os.path.join("venv", "Scripts", "pip")
     else:  # Unix/Linux/macOS
         activate_cmd = "source venv/bin/activate"
-        pip_cmd = "venv/bin/pip"
+        pip_cmd = os.path.join("venv", "bin", "pip")
     
-    if not run_command(f"{pip_cmd} install --upgrade pip", "Upgrading pip"):
+    if not run_command([pip_cmd, "install", "--upgrade", "pip", "wheel", "setuptools"], "Upgrading pip"):
         sys.exit(1)
     
-    if not run_command(f"{pip_cmd} install -r requirements.txt", "Installing dependencies"):
+    # Prefer prebuilt wheels so numpy/scipy/torch are never compiled from source
+    if not run_command([pip_cmd, "install", "--prefer-binary", "-r", "requirements.txt"], "Installing dependencies"):
         sys.exit(1)
     
     # Create environment file
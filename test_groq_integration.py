@@ -7,13 +7,14 @@ import os
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 
+# Read .env and the API key once for the whole module
+load_dotenv()
+API_KEY = os.getenv("GROQ_API_KEY")
+
 def test_groq_connection():
     """Test basic Groq connection and response"""
-    load_dotenv()
-    
     # Check if API key is set
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
+    if not API_KEY:
         print("❌ GROQ_API_KEY not found in environment variables")
         return False
     
@@ -22,7 +23,7 @@ def test_groq_connection():
         llm = ChatGroq(
             model_name="llama3-8b-8192",
             temperature=0.1,
-            api_key=api_key
+            api_key=API_KEY
         )
         
         # Test simple query
@@ -4,37 +4,51 @@ A comprehensive GenAI solution to provide domain expertise across multiple banki
 """
 
 import os
-import json
+import re
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+import uuid
+import weakref
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, Union
 from datetime import datetime
 import asyncio
+from collections import Counter, deque
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 
 # AI/ML Libraries
 import groq
-from langchain.chains import LLMChain
+import chromadb
+from chromadb.config import Settings
 from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable
 from langchain_groq import ChatGroq
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.embeddings import HuggingFaceEmbeddings, InfinityEmbeddings
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain_community.vectorstores import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader, TextLoader, CSVLoader
 from langchain.schema import Document
 
 # FastAPI for web interface
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+import orjson
 import uvicorn
 
 # Database
 import sqlite3
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Integer
+from sqlalchemy import bindparam, create_engine, event, insert, text, Column, String, Text, DateTime, Integer, func
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 # Configuration
 from dotenv import load_dotenv
@@ -46,6 +60,82 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of documents embedded per vector store call when loading on startup or
+# adding documents in bulk
+LOAD_BATCH_SIZE = 256
+
+# Embedding inference backend: "torch" (default), "onnx" for an int8-quantized
+# ONNX Runtime model (needs optimum[onnxruntime]; the quantized file is fetched
+# once into the Hugging Face cache), or "infinity" for an Infinity embedding
+# server that batches concurrent requests out of process
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+INFINITY_API_URL = os.getenv("INFINITY_API_URL", "http://localhost:7997")
+
+# Upper bound on distinct documents put into the LLM context for one query
+MAX_CONTEXT_DOCS = 10
+
+# Minimum relevance (1 - cosine distance) for a retrieved document to be used
+RELEVANCE_THRESHOLD = float(os.getenv("RELEVANCE_THRESHOLD", "0.35"))
+
+# Answers used when the knowledge base or the LLM cannot provide one
+NO_INFORMATION_ANSWER = "I don't have sufficient information to answer your question. Please try rephrasing or contact a human expert."
+UNAVAILABLE_ANSWER = "I apologize, but I'm unable to generate a response at this time."
+
+# Domain experts open their answer with a "CONFIDENCE: <0-1>" line; an expert at
+# or above this level answers alone and the other experts' calls are cancelled
+EARLY_ANSWER_CONFIDENCE = 0.85
+# A first line mentioning confidence is the marker, however the model formats it
+# ("**Confidence: 0.9**", "CONFIDENCE: High", "Confidence: 90%.")
+CONFIDENCE_SCORE = re.compile(r"confidence\D*?([0-9]*\.?[0-9]+)[ \t]*(%?)", re.IGNORECASE)
+# A numeric marker with the answer after it on the same line
+CONFIDENCE_PREFIX = re.compile(
+    r"^[\s*_#>`]*confidence[\s*_`]*[:=-]?[\s*_`]*[0-9]*\.?[0-9]+[ \t]*%?[\s*_`.,;:)\]-]*",
+    re.IGNORECASE
+)
+
+# Share of retrieved documents above which a single domain expert answers alone
+DOMINANT_DOMAIN_SHARE = 0.8
+
+# Keyword pre-filter: at most this many FTS5 matches are passed to vector search
+KEYWORD_CANDIDATE_LIMIT = 200
+KEYWORD_STOPWORDS = frozenset({
+    "the", "and", "for", "are", "what", "how", "does", "which", "who", "why", "when",
+    "with", "from", "that", "this", "into", "about", "should", "can", "our", "you"
+})
+
+# Full-text index over document titles and content, kept in sync by triggers
+KEYWORD_INDEX_STATEMENTS = (
+    """CREATE VIRTUAL TABLE doc_fts USING fts5(
+        title, content, content='documents', content_rowid='rowid'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+        INSERT INTO doc_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+        INSERT INTO doc_fts(doc_fts, rowid, title, content)
+        VALUES ('delete', old.rowid, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE ON documents BEGIN
+        INSERT INTO doc_fts(doc_fts, rowid, title, content)
+        VALUES ('delete', old.rowid, old.title, old.content);
+        INSERT INTO doc_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+    END""",
+    # Index the rows that existed before the table did
+    "INSERT INTO doc_fts(doc_fts) VALUES ('rebuild')"
+)
+
+# Cosine similarity above which a previous query's response is reused
+RESPONSE_CACHE_THRESHOLD = 0.95
+# Most answers kept in the response cache; the oldest are evicted first
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+
+# HNSW index settings for the knowledge collection: cosine distance on the
+# sentence embeddings, so relevance is 1 - distance
+KNOWLEDGE_INDEX_METADATA = {
+    "hnsw:space": "cosine"
+}
+
 # Enums and Data Classes
 class BankingDomain(Enum):
     DISTRIBUTION_FINANCE = "distribution_finance"
@@ -55,6 +145,9 @@ class BankingDomain(Enum):
     COMPLIANCE = "compliance"
     CUSTOMER_SERVICE = "customer_service"
 
+# Every domain, built once for the per-request defaults and lookups
+ALL_DOMAINS: Tuple[BankingDomain, ...] = tuple(BankingDomain)
+
 @dataclass
 class KnowledgeDocument:
     id: str
@@ -82,7 +175,7 @@ class DocumentModel(Base):
     id = Column(String, primary_key=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    domain = Column(String, nullable=False)
+    domain = Column(String, nullable=False, index=True)
     source = Column(String, nullable=False)
     upload_date = Column(DateTime, default=datetime.utcnow)
     document_metadata = Column(Text)  # JSON string
@@ -91,12 +184,21 @@ class QueryLog(Base):
     __tablename__ = "query_logs"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(String, nullable=False)
+    user_id = Column(String, nullable=False, index=True)
     query = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
     domains_consulted = Column(Text)  # JSON string
     confidence = Column(String, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Enable WAL and a larger page cache on every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
 # Pydantic Models for API
 class QueryRequest(BaseModel):
@@ -119,14 +221,112 @@ class DocumentUploadRequest(BaseModel):
     source: str
     metadata: Optional[Dict[str, Any]] = None
 
+def _match_confidence(answer: str) -> Tuple[Optional[float], str]:
+    """Split a leading confidence line from the text after it, which may be empty"""
+    line, newline, remainder = answer.lstrip().partition("\n")
+    if "confidence" not in line.lower():
+        return None, answer
+    
+    confidence = None
+    score = CONFIDENCE_SCORE.search(line)
+    if score:
+        confidence = float(score.group(1))
+        if score.group(2):
+            confidence /= 100
+        # Scores outside 0-1 are not trusted for early answers
+        if confidence > 1.0:
+            confidence = None
+    
+    # Keep an answer the model started on the marker's own line
+    prefix = CONFIDENCE_PREFIX.match(line)
+    if prefix and line[prefix.end():].strip():
+        return confidence, line[prefix.end():].lstrip() + newline + remainder
+    return confidence, remainder.lstrip()
+
+def _split_confidence(answer: str) -> Tuple[Optional[float], str]:
+    """Separate a domain expert's leading CONFIDENCE marker from its answer"""
+    confidence, rest = _match_confidence(answer)
+    # A reply that is nothing but the marker is kept as it is
+    return confidence, rest or answer
+
+async def _astrip_confidence(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Drop the leading CONFIDENCE marker from a streamed domain expert answer"""
+    buffer = ""
+    marker = ""
+    strip_next = False
+    yielded = False
+    async for chunk in chunks:
+        if buffer is None:
+            # Skip the whitespace between a marker on its own line and the answer
+            if strip_next:
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                strip_next = False
+            yielded = True
+            yield chunk
+            continue
+        
+        # Hold back the first line until it is complete, or until the answer has
+        # started after a marker on the same line
+        buffer += chunk
+        line, newline, _ = buffer.lstrip().partition("\n")
+        if not newline:
+            prefix = CONFIDENCE_PREFIX.match(line)
+            if not (prefix and line[prefix.end():].strip()):
+                continue
+        
+        _, rest = _match_confidence(buffer)
+        marker, buffer = buffer, None
+        if rest:
+            yielded = True
+            yield rest
+        else:
+            strip_next = True
+    
+    if buffer:
+        # The stream ended inside the marker
+        yield _split_confidence(buffer)[1]
+    elif marker and not yielded:
+        yield marker
+
+def _create_embeddings(backend: str = EMBEDDING_BACKEND):
+    """Create the sentence embedding model for the configured inference backend"""
+    if backend == "infinity":
+        return InfinityEmbeddings(model=DEFAULT_EMBEDDING_MODEL, infinity_api_url=INFINITY_API_URL)
+    
+    model_kwargs = {'device': 'cpu'}
+    if backend == "onnx":
+        # int8 weights run on the CPU's VNNI dot-product instructions
+        model_kwargs.update(backend="onnx", model_kwargs={"file_name": EMBEDDING_ONNX_FILE})
+    elif backend != "torch":
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+    
+    return HuggingFaceEmbeddings(
+        model_name=DEFAULT_EMBEDDING_MODEL,
+        model_kwargs=model_kwargs,
+        encode_kwargs={'batch_size': 64}
+    )
+
 class VirtualSMESystem:
     def __init__(self):
         # Using HuggingFace embeddings (free, local) with Groq LLM
         # This provides a complete solution without requiring OpenAI API
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name=DEFAULT_EMBEDDING_MODEL,
-            model_kwargs={'device': 'cpu'}
-        )
+        self.embeddings = _create_embeddings()
+        # Cache document embeddings on disk, keyed by a hash of the text, so
+        # re-ingesting identical content skips the model forward pass; quantized
+        # vectors differ slightly, so each non-default backend gets its own namespace
+        if os.getenv("VIRTUALSME_EMB_CACHE", "1") == "1":
+            namespace = DEFAULT_EMBEDDING_MODEL
+            if EMBEDDING_BACKEND != "torch":
+                namespace = f"{DEFAULT_EMBEDDING_MODEL}:{EMBEDDING_BACKEND}"
+            self.embeddings = CacheBackedEmbeddings.from_bytes_store(
+                self.embeddings,
+                LocalFileStore(os.getenv("VIRTUALSME_EMB_CACHE_DIR", "./emb_cache")),
+                namespace=namespace
+            )
+        # Keep recent query embeddings in memory so repeated questions skip the encoder
+        self._embed_query = lru_cache(maxsize=1024)(self._compute_query_embedding)
         # Using Groq's Llama3-8b model for fast, cost-effective inference
         # Alternative models: "mixtral-8x7b-32768", "llama3-70b-8192", "gemma2-9b-it"
         self.llm = ChatGroq(
@@ -134,21 +334,234 @@ class VirtualSMESystem:
             temperature=DEFAULT_TEMPERATURE,
             api_key=os.getenv("GROQ_API_KEY")
         )
+        # Upper bound on concurrent Groq calls across all queries, to stay under rate
+        # limits. asyncio semaphores belong to one event loop, so each loop running
+        # queries (the server's and the sync wrappers') gets its own
+        self.llm_concurrency = int(os.getenv("GROQ_MAX_CONCURRENCY", "4"))
+        self._llm_semaphores = weakref.WeakKeyDictionary()
+        self._llm_semaphores_lock = threading.Lock()
         
-        # Initialize vector stores for each domain
-        self.vector_stores = {}
+        # Event loop for the synchronous wrappers, started on first use. The LLM's
+        # async HTTP client binds its pooled connections to the loop it first runs
+        # on, so every sync call has to reuse one long-lived loop
+        self._sync_loop = None
+        self._sync_loop_lock = threading.Lock()
+        
+        # Initialize one vector store for all domains on an in-memory Chroma client
+        # (rebuilt from the database on startup, so no SQLite persistence); each
+        # document carries its domain in metadata and queries filter on it
+        self.chroma_client = chromadb.EphemeralClient(
+            settings=Settings(anonymized_telemetry=False)
+        )
+        self.vector_store = Chroma(
+            client=self.chroma_client,
+            embedding_function=self.embeddings,
+            collection_name="knowledge",
+            collection_metadata=KNOWLEDGE_INDEX_METADATA
+        )
+        # Semantic cache of answered queries, looked up by query embedding; entry
+        # IDs are kept in insertion order so the oldest can be evicted
+        self._response_cache_ids = deque()
+        self._response_cache_lock = threading.Lock()
+        self._reset_response_cache()
         self.document_processors = {}
         self.domain_experts = {}
+        self.domain_chains: Dict[BankingDomain, Runnable] = {}
         
         # Initialize database
-        self.engine = create_engine("sqlite:///virtual_sme.db")
+        # Pooled connections shared across threads; each request gets its own session
+        self.engine = create_engine(
+            "sqlite:///virtual_sme.db",
+            connect_args={"check_same_thread": False},
+            pool_size=10,
+            max_overflow=20
+        )
+        event.listen(self.engine, "connect", _configure_sqlite)
         Base.metadata.create_all(self.engine)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self.db_session = SessionLocal()
+        # create_all skips tables that already exist, so add any indexes
+        # missing from databases created before they were declared
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.keyword_index_enabled = self._initialize_keyword_index()
         
         self._initialize_domain_experts()
         self._load_existing_knowledge()
     
+    def _initialize_keyword_index(self) -> bool:
+        """Create the FTS5 keyword index on first start; returns whether it is available"""
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'doc_fts'"
+                )).first()
+                if not exists:
+                    for statement in KEYWORD_INDEX_STATEMENTS:
+                        conn.execute(text(statement))
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Keyword index unavailable, using vector search only: {e}")
+            return False
+    
+    def _keyword_candidates(self, query: str,
+                            domains: Optional[List[BankingDomain]] = None) -> List[str]:
+        """Return IDs of the documents in the given domains that best match the query's keywords"""
+        if not self.keyword_index_enabled:
+            return []
+        
+        terms = []
+        for term in re.findall(r"\w+", query.lower()):
+            if len(term) > 2 and term not in KEYWORD_STOPWORDS and term not in terms:
+                terms.append(term)
+        if not terms:
+            return []
+        
+        # Quote each term so user input cannot inject FTS5 query syntax
+        match = " OR ".join(f'"{term}"' for term in terms)
+        params = {"match": match, "limit": KEYWORD_CANDIDATE_LIMIT}
+        
+        # Filter by domain before the limit so other domains cannot crowd out the candidates
+        domain_clause = ""
+        if domains:
+            domain_clause = "AND documents.domain IN :domains "
+            params["domains"] = [domain.value for domain in domains]
+        
+        statement = text(
+            "SELECT documents.id FROM doc_fts "
+            "JOIN documents ON documents.rowid = doc_fts.rowid "
+            f"WHERE doc_fts MATCH :match {domain_clause}ORDER BY rank LIMIT :limit"
+        )
+        if domains:
+            statement = statement.bindparams(bindparam("domains", expanding=True))
+        
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement, params)
+                return [row[0] for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Error searching keyword index: {e}")
+            return []
+    
+    async def _asearch(self, query_embedding: List[float], k: int,
+                       conditions: List[Dict[str, Any]]) -> List[Tuple[Document, float]]:
+        """Run one vector search restricted by the given metadata conditions"""
+        search_filter = None
+        if len(conditions) == 1:
+            search_filter = conditions[0]
+        elif conditions:
+            search_filter = {"$and": conditions}
+        
+        try:
+            return await asyncio.to_thread(
+                self.vector_store.similarity_search_by_vector_with_relevance_scores,
+                query_embedding,
+                k=k,
+                filter=search_filter
+            )
+        except Exception as e:
+            logger.error(f"Error searching knowledge base with filter {search_filter}: {e}")
+            return []
+    
+    def _reset_response_cache(self):
+        """Start an empty response cache, dropping any cached answers"""
+        with self._response_cache_lock:
+            try:
+                self.chroma_client.delete_collection("response_cache")
+            except Exception:
+                # Nothing cached yet
+                pass
+            self.response_cache = self.chroma_client.create_collection(
+                name="response_cache",
+                metadata={"hnsw:space": "cosine"},
+                embedding_function=None
+            )
+            self._response_cache_ids.clear()
+    
+    def _response_cache_key(self, preferred_domains: Optional[List[BankingDomain]]) -> str:
+        """Cache partition for a domain selection; answers differ by the domains consulted"""
+        if not preferred_domains:
+            return "all"
+        return ",".join(sorted({domain.value for domain in preferred_domains}))
+    
+    def _cached_response(self, query_embedding: List[float], cache_key: str) -> Optional[QueryResponse]:
+        """Return the cached response to a near-identical query, if there is one"""
+        try:
+            if self.response_cache.count() == 0:
+                return None
+            
+            hits = self.response_cache.query(
+                query_embeddings=[query_embedding],
+                n_results=1,
+                where={"domains": cache_key},
+                include=["metadatas", "distances"]
+            )
+            if not hits["ids"][0] or 1.0 - hits["distances"][0][0] < RESPONSE_CACHE_THRESHOLD:
+                return None
+            
+            cached = orjson.loads(hits["metadatas"][0][0]["response"])
+            return QueryResponse(
+                answer=cached["answer"],
+                sources=cached["sources"],
+                confidence=cached["confidence"],
+                domains_consulted=[BankingDomain(d) for d in cached["domains_consulted"]],
+                timestamp=datetime.utcnow()
+            )
+            
+        except Exception as e:
+            logger.error(f"Error reading response cache: {e}")
+            return None
+    
+    def _cache_response(self, query_embedding: List[float], cache_key: str, response: QueryResponse):
+        """Store a response for reuse by later near-identical queries"""
+        entry_id = uuid.uuid4().hex
+        try:
+            with self._response_cache_lock:
+                # Evict the oldest answers so the cache stays bounded on a long-running server
+                evicted = []
+                while len(self._response_cache_ids) >= RESPONSE_CACHE_MAX_ENTRIES:
+                    evicted.append(self._response_cache_ids.popleft())
+                if evicted:
+                    self.response_cache.delete(ids=evicted)
+                
+                self._response_cache_ids.append(entry_id)
+            
+            self.response_cache.add(
+                ids=[entry_id],
+                embeddings=[query_embedding],
+                metadatas=[{
+                    "domains": cache_key,
+                    "response": orjson.dumps({
+                        "answer": response.answer,
+                        "sources": response.sources,
+                        "confidence": response.confidence,
+                        "domains_consulted": [d.value for d in response.domains_consulted]
+                    }).decode()
+                }]
+            )
+            
+        except Exception as e:
+            logger.error(f"Error writing response cache: {e}")
+    
+    @contextmanager
+    def _session(self, db: Optional[Session] = None):
+        """Use the caller's session, or open a short-lived one and close it afterwards"""
+        if db is not None:
+            yield db
+            return
+        
+        db = self.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    def _compute_query_embedding(self, query: str) -> Tuple[float, ...]:
+        """Embed a query, as a tuple so the cached vector cannot be mutated by callers"""
+        return tuple(self.embeddings.embed_query(query))
+    
     def _initialize_domain_experts(self):
         """Initialize specialized prompts for each banking domain"""
         
@@ -230,251 +643,602 @@ class VirtualSMESystem:
         for domain, prompt in domain_prompts.items():
             self.domain_experts[domain] = PromptTemplate(
                 input_variables=["context", "question"],
-                template=f"{prompt}\n\nContext: {{context}}\n\nQuestion: {{question}}\n\nAnswer:"
+                template=(
+                    f"{prompt}\n\nContext: {{context}}\n\nQuestion: {{question}}\n\n"
+                    "Start your reply with a line of the form \"CONFIDENCE: X\", where X is a "
+                    "number from 0 to 1 saying how completely the context answers the question, "
+                    "then give your answer."
+                )
             )
+            # Build each expert's runnable once rather than on every query
+            self.domain_chains[domain] = self.domain_experts[domain] | self.llm | StrOutputParser()
+        
+        # Prompt used to merge the answers of several domain experts
+        synthesis_prompt = PromptTemplate(
+            input_variables=["responses", "question"],
+            template="""
+            You are a banking expert synthesizing information from multiple domain specialists.
+            
+            Original Question: {question}
+            
+            Domain-specific responses:
+            {responses}
+            
+            Please provide a comprehensive, well-structured answer that:
+            1. Addresses the original question completely
+            2. Integrates insights from all relevant domains
+            3. Avoids redundancy while maintaining completeness
+            4. Provides clear, actionable information
+            5. Cites the relevant domains when appropriate
+            
+            Comprehensive Answer:
+            """
+        )
+        self.synthesis_chain = synthesis_prompt | self.llm | StrOutputParser()
     
-    def _load_existing_knowledge(self):
-        """Load existing knowledge documents from database into vector stores"""
+    def _load_existing_knowledge(self, db: Optional[Session] = None):
+        """Load existing knowledge documents from database into the vector store"""
         try:
-            documents = self.db_session.query(DocumentModel).all()
+            loaded = 0
+            batch = []
             
-            for doc in documents:
-                domain = BankingDomain(doc.domain)
-                if domain not in self.vector_stores:
-                    self.vector_stores[domain] = Chroma(
-                        embedding_function=self.embeddings,
-                        collection_name=f"knowledge_{domain.value}"
-                    )
+            # Stream rows from the database and add them to the vector store in
+            # fixed-size batches, so memory and Chroma's per-call limit stay bounded
+            with self._session(db) as db:
+                for doc in db.query(DocumentModel).yield_per(LOAD_BATCH_SIZE):
+                    batch.append(doc)
+                    if len(batch) == LOAD_BATCH_SIZE:
+                        self._add_document_rows(batch)
+                        loaded += len(batch)
+                        batch = []
                 
-                # Add document to vector store
-                self.vector_stores[domain].add_documents([
-                    Document(
-                        page_content=doc.content,
-                        metadata={
-                            "title": doc.title,
-                            "source": doc.source,
-                            "domain": doc.domain,
-                            "upload_date": doc.upload_date.isoformat()
-                        }
-                    )
-                ])
+                if batch:
+                    self._add_document_rows(batch)
+                    loaded += len(batch)
             
-            logger.info(f"Loaded {len(documents)} existing documents into vector stores")
+            logger.info(f"Loaded {loaded} existing documents into the vector store")
             
         except Exception as e:
             logger.error(f"Error loading existing knowledge: {e}")
     
-    def add_knowledge_document(self, document: KnowledgeDocument) -> bool:
+    def _add_document_rows(self, rows: List[DocumentModel]):
+        """Embed and add a batch of database rows to the vector store in one call"""
+        self.vector_store.add_documents([
+            self._vector_document(row.id, row.title, row.content, row.source, row.domain, row.upload_date)
+            for row in rows
+        ], ids=[row.id for row in rows])
+    
+    def _to_document_model(self, document: KnowledgeDocument) -> DocumentModel:
+        """Build the database row for a knowledge document"""
+        return DocumentModel(
+            id=document.id,
+            title=document.title,
+            content=document.content,
+            domain=document.domain.value,
+            source=document.source,
+            upload_date=document.upload_date,
+            document_metadata=orjson.dumps(document.metadata).decode()
+        )
+    
+    def _to_vector_document(self, document: KnowledgeDocument) -> Document:
+        """Build the vector store document for a knowledge document"""
+        return self._vector_document(
+            document.id, document.title, document.content, document.source,
+            document.domain.value, document.upload_date
+        )
+    
+    def _vector_document(self, doc_id: str, title: str, content: str, source: str,
+                         domain: str, upload_date: datetime) -> Document:
+        """Build a vector store document with the metadata retrieval filters on"""
+        return Document(
+            page_content=content,
+            metadata={
+                "title": title,
+                "source": source,
+                "domain": domain,
+                "doc_id": doc_id,
+                "upload_date": upload_date.isoformat()
+            }
+        )
+    
+    def add_knowledge_document(self, document: KnowledgeDocument, db: Optional[Session] = None) -> bool:
         """Add a new knowledge document to the system"""
-        try:
-            # Save to database
-            doc_model = DocumentModel(
-                id=document.id,
-                title=document.title,
-                content=document.content,
-                domain=document.domain.value,
-                source=document.source,
-                upload_date=document.upload_date,
-                metadata=json.dumps(document.metadata)
-            )
-            
-            self.db_session.add(doc_model)
-            self.db_session.commit()
-            
-            # Add to vector store
-            if document.domain not in self.vector_stores:
-                self.vector_stores[document.domain] = Chroma(
-                    embedding_function=self.embeddings,
-                    collection_name=f"knowledge_{document.domain.value}"
-                )
-            
-            self.vector_stores[document.domain].add_documents([
-                Document(
-                    page_content=document.content,
-                    metadata={
-                        "title": document.title,
-                        "source": document.source,
-                        "domain": document.domain.value,
-                        "upload_date": document.upload_date.isoformat()
-                    }
+        with self._session(db) as db:
+            try:
+                # Save to database
+                db.add(self._to_document_model(document))
+                db.commit()
+                
+                # Add to vector store
+                self.vector_store.add_documents(
+                    [self._to_vector_document(document)], ids=[document.id]
                 )
-            ])
-            
-            logger.info(f"Successfully added document: {document.title}")
+                # Cached answers may not reflect the new document
+                self._reset_response_cache()
+                
+                logger.info(f"Successfully added document: {document.title}")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Error adding document: {e}")
+                db.rollback()
+                return False
+    
+    def add_knowledge_documents(self, documents: List[KnowledgeDocument],
+                                db: Optional[Session] = None) -> bool:
+        """Add several knowledge documents with one commit and one embedding pass"""
+        if not documents:
             return True
-            
-        except Exception as e:
-            logger.error(f"Error adding document: {e}")
-            self.db_session.rollback()
-            return False
+        
+        with self._session(db) as db:
+            try:
+                # Save to database in a single transaction
+                db.add_all([self._to_document_model(doc) for doc in documents])
+                db.commit()
+                
+                # Embed in fixed-size batches to stay under Chroma's per-call limit
+                for start in range(0, len(documents), LOAD_BATCH_SIZE):
+                    batch = documents[start:start + LOAD_BATCH_SIZE]
+                    self.vector_store.add_documents(
+                        [self._to_vector_document(doc) for doc in batch],
+                        ids=[doc.id for doc in batch]
+                    )
+                # Cached answers may not reflect the new documents
+                self._reset_response_cache()
+                
+                logger.info(f"Successfully added {len(documents)} documents")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Error adding documents: {e}")
+                db.rollback()
+                return False
+    
+    def _run_sync(self, coroutine):
+        """Run a coroutine on the background event loop and wait for its result"""
+        with self._sync_loop_lock:
+            if self._sync_loop is None:
+                self._sync_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._sync_loop.run_forever, name="virtual-sme-loop", daemon=True
+                ).start()
+        
+        return asyncio.run_coroutine_threadsafe(coroutine, self._sync_loop).result()
     
     def query_knowledge_base(self, query: str, user_id: str, 
                            preferred_domains: Optional[List[BankingDomain]] = None,
                            context: Optional[str] = None) -> QueryResponse:
         """Query the knowledge base across all domains"""
+        return self._run_sync(self.aquery_knowledge_base(
+            query, user_id, preferred_domains=preferred_domains, context=context
+        ))
+    
+    def batch_query_knowledge_base(self, queries: List[str], user_id: str,
+                                   preferred_domains: Optional[List[Optional[List[BankingDomain]]]] = None
+                                   ) -> List[QueryResponse]:
+        """Query the knowledge base with several questions at once"""
+        return self._run_sync(self.abatch_query_knowledge_base(
+            queries, user_id, preferred_domains=preferred_domains
+        ))
+    
+    async def abatch_query_knowledge_base(self, queries: List[str], user_id: str,
+                                          preferred_domains: Optional[List[Optional[List[BankingDomain]]]] = None
+                                          ) -> List[QueryResponse]:
+        """Query the knowledge base with several questions, embedding them in one batch"""
+        if preferred_domains is not None and len(preferred_domains) != len(queries):
+            raise ValueError(
+                f"preferred_domains has {len(preferred_domains)} entries for {len(queries)} queries"
+            )
+        if not queries:
+            return []
         
-        # Determine which domains to search
-        domains_to_search = preferred_domains or list(BankingDomain)
+        # One forward pass for all questions instead of one per question
+        query_embeddings = await asyncio.to_thread(self.embeddings.embed_documents, queries)
+        domains_per_query = preferred_domains or [None] * len(queries)
         
-        # Collect relevant documents from all domains
-        all_relevant_docs = []
-        domains_consulted = []
-        
-        for domain in domains_to_search:
-            if domain in self.vector_stores:
-                try:
-                    # Search for relevant documents
-                    docs = self.vector_stores[domain].similarity_search(
-                        query, k=5
-                    )
-                    
-                    if docs:
-                        all_relevant_docs.extend(docs)
-                        domains_consulted.append(domain)
-                        
-                except Exception as e:
-                    logger.error(f"Error searching domain {domain}: {e}")
+        results = await asyncio.gather(*[
+            self.aquery_knowledge_base(
+                query, user_id, preferred_domains=domains, query_embedding=embedding
+            )
+            for query, domains, embedding in zip(queries, domains_per_query, query_embeddings)
+        ], return_exceptions=True)
+        
+        # A failed question gets an unavailable answer instead of discarding the others
+        responses = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error answering batched query {query!r}: {result}")
+                result = self._unavailable_response()
+            responses.append(result)
+        
+        return responses
+    
+    async def aquery_knowledge_base(self, query: str, user_id: str, 
+                                    preferred_domains: Optional[List[BankingDomain]] = None,
+                                    context: Optional[str] = None,
+                                    query_embedding: Optional[List[float]] = None,
+                                    log_query: bool = True) -> QueryResponse:
+        """Query the knowledge base across all domains without blocking the event loop"""
+        
+        # Embed the query once; it serves both the response cache and retrieval
+        if query_embedding is None:
+            query_embedding = list(await asyncio.to_thread(self._embed_query, query))
+        
+        # Reuse the answer to a near-identical earlier query over the same domains
+        cache_key = self._response_cache_key(preferred_domains)
+        response = await asyncio.to_thread(self._cached_response, query_embedding, cache_key)
+        if response is not None:
+            if log_query:
+                await asyncio.to_thread(
+                    self._log_query, user_id, query, response.answer,
+                    response.domains_consulted, response.confidence
+                )
+            return response
+        
+        all_relevant_docs, relevance_scores, domains_consulted = await self._aretrieve(
+            query, preferred_domains, query_embedding
+        )
         
         if not all_relevant_docs:
-            return QueryResponse(
-                answer="I don't have sufficient information to answer your question. Please try rephrasing or contact a human expert.",
-                sources=[],
-                confidence=0.0,
-                domains_consulted=[],
-                timestamp=datetime.utcnow()
-            )
+            return self._no_information_response()
         
-        # Create context from relevant documents
-        context_text = "\n\n".join([
-            f"Source: {doc.metadata.get('title', 'Unknown')}\n{doc.page_content}"
-            for doc in all_relevant_docs
-        ])
+        context_text = self._build_context(all_relevant_docs)
         
-        # Generate response using domain experts
-        responses = []
-        for domain in domains_consulted:
-            if domain in self.domain_experts:
-                try:
-                    chain = LLMChain(
-                        llm=self.llm,
-                        prompt=self.domain_experts[domain]
-                    )
-                    
-                    response = chain.run({
-                        "context": context_text,
-                        "question": query
-                    })
-                    
-                    responses.append({
-                        "domain": domain,
-                        "response": response
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error generating response for domain {domain}: {e}")
+        # Generate responses from all domain experts concurrently; only the experts
+        # whose answers are used count as consulted (one, if it answered confidently)
+        responses, experts_complete = await self._aask_experts(domains_consulted, context_text, query)
+        if responses:
+            domains_consulted = [resp["domain"] for resp in responses]
         
         # Combine responses from multiple domains
         if responses:
-            combined_response = self._combine_domain_responses(responses, query)
+            combined_response, synthesized = await self._acombine_domain_responses(responses, query)
+        else:
+            combined_response, synthesized = UNAVAILABLE_ANSWER, False
+        
+        response = self._build_response(
+            combined_response, all_relevant_docs, relevance_scores, domains_consulted
+        )
+        
+        # Only complete answers are reused for later queries
+        if experts_complete and synthesized:
+            await asyncio.to_thread(self._cache_response, query_embedding, cache_key, response)
+        
+        # Log the query, unless the caller writes the log itself off the request path
+        if log_query:
+            await asyncio.to_thread(
+                self._log_query, user_id, query, response.answer, domains_consulted, response.confidence
+            )
+        
+        return response
+    
+    async def astream_knowledge_base(self, query: str, user_id: str,
+                                     preferred_domains: Optional[List[BankingDomain]] = None
+                                     ) -> AsyncIterator[Union[str, QueryResponse]]:
+        """Yield answer text as it is generated, then the complete QueryResponse"""
+        
+        query_embedding = list(await asyncio.to_thread(self._embed_query, query))
+        
+        # A cached answer is sent in one piece
+        cache_key = self._response_cache_key(preferred_domains)
+        response = await asyncio.to_thread(self._cached_response, query_embedding, cache_key)
+        if response is not None:
+            yield response.answer
+            yield response
+            await asyncio.to_thread(
+                self._log_query, user_id, query, response.answer,
+                response.domains_consulted, response.confidence
+            )
+            return
+        
+        all_relevant_docs, relevance_scores, domains_consulted = await self._aretrieve(
+            query, preferred_domains, query_embedding
+        )
+        
+        if not all_relevant_docs:
+            response = self._no_information_response()
+            yield response.answer
+            yield response
+            return
+        
+        context_text = self._build_context(all_relevant_docs)
+        
+        # Several experts answer up front (only their synthesis is streamed);
+        # a lone expert's answer is streamed token by token
+        expert_domains = [domain for domain in domains_consulted if domain in self.domain_chains]
+        responses = None
+        experts_complete = True
+        if len(expert_domains) != 1:
+            responses, experts_complete = await self._aask_experts(expert_domains, context_text, query)
+            if responses:
+                domains_consulted = [resp["domain"] for resp in responses]
+        
+        chunks = []
+        completed = False
+        try:
+            async for chunk in self._astream_answer(expert_domains, responses, context_text, query):
+                chunks.append(chunk)
+                yield chunk
+            completed = experts_complete and (responses is None or bool(responses))
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            if not chunks:
+                # Fallback to concatenating the experts' responses, if there are any
+                fallback = "\n\n".join([resp["response"] for resp in responses or []])
+                chunks.append(fallback or UNAVAILABLE_ANSWER)
+                yield chunks[0]
+        
+        response = self._build_response(
+            "".join(chunks), all_relevant_docs, relevance_scores, domains_consulted
+        )
+        yield response
+        
+        # Only complete answers are reused for later queries
+        if completed:
+            await asyncio.to_thread(self._cache_response, query_embedding, cache_key, response)
+        
+        # The client already has the full answer; write the audit log last
+        await asyncio.to_thread(
+            self._log_query, user_id, query, response.answer, domains_consulted, response.confidence
+        )
+    
+    async def _aretrieve(self, query: str, preferred_domains: Optional[List[BankingDomain]] = None,
+                         query_embedding: Optional[List[float]] = None
+                         ) -> Tuple[List[Document], List[float], List[BankingDomain]]:
+        """Find the documents relevant to a query, their relevance and the domains to consult"""
+        
+        # Determine which domains to search
+        domains_to_search = preferred_domains or ALL_DOMAINS
+        
+        # Embed the query once and reuse the vector for every domain
+        if query_embedding is None:
+            query_embedding = list(await asyncio.to_thread(self._embed_query, query))
+        
+        # Search all requested domains with one query against the shared store; the
+        # domain filter is only needed when some domains are excluded
+        domain_conditions = []
+        keyword_domains = None
+        if len(set(domains_to_search)) < len(ALL_DOMAINS):
+            domain_conditions.append(
+                {"domain": {"$in": [domain.value for domain in domains_to_search]}}
+            )
+            keyword_domains = list(domains_to_search)
+        k = 5 * len(domains_to_search)
+        
+        # Narrow the vector search to documents in the requested domains sharing
+        # keywords with the query
+        candidate_ids = await asyncio.to_thread(self._keyword_candidates, query, keyword_domains)
+        if candidate_ids:
+            scored_docs = await self._asearch(
+                query_embedding, k, domain_conditions + [{"doc_id": {"$in": candidate_ids}}]
+            )
         else:
-            combined_response = "I apologize, but I'm unable to generate a response at this time."
+            scored_docs = []
         
-        # Calculate confidence based on number of sources and domain coverage
-        confidence = min(0.9, len(all_relevant_docs) * 0.1 + len(domains_consulted) * 0.1)
+        # Keyword matches that are not semantically relevant (or none at all)
+        # fall back to a search over every document in the requested domains
+        if not any(1.0 - distance >= RELEVANCE_THRESHOLD for _, distance in scored_docs):
+            scored_docs = await self._asearch(query_embedding, k, domain_conditions)
         
-        # Log the query
-        self._log_query(user_id, query, combined_response, domains_consulted, confidence)
+        # Keep documents above the relevance threshold, closest match first,
+        # dropping duplicate content and capping the context size
+        all_relevant_docs = []
+        relevance_scores = []
+        seen = set()
+        for doc, distance in sorted(scored_docs, key=lambda pair: pair[1]):
+            relevance = 1.0 - distance
+            if relevance < RELEVANCE_THRESHOLD:
+                break
+            
+            key = (doc.metadata.get('title'), hash(doc.page_content))
+            if key not in seen:
+                seen.add(key)
+                all_relevant_docs.append(doc)
+                relevance_scores.append(relevance)
+            if len(all_relevant_docs) == MAX_CONTEXT_DOCS:
+                break
+        
+        # A domain is consulted when at least one retrieved document belongs to it
+        retrieved_domains = {doc.metadata.get("domain") for doc in all_relevant_docs}
+        domains_consulted = [
+            domain for domain in domains_to_search if domain.value in retrieved_domains
+        ]
+        
+        # When one domain supplies most of the retrieved documents, ask only that
+        # expert; with a single response the synthesis call is skipped as well
+        if len(domains_consulted) > 1:
+            top_domain, top_count = Counter(
+                doc.metadata.get('domain') for doc in all_relevant_docs
+            ).most_common(1)[0]
+            if top_count / len(all_relevant_docs) >= DOMINANT_DOMAIN_SHARE:
+                domains_consulted = [BankingDomain(top_domain)]
+        
+        return all_relevant_docs, relevance_scores, domains_consulted
+    
+    def _build_context(self, docs: List[Document]) -> str:
+        """Create the LLM context from relevant documents"""
+        return "\n\n".join([
+            f"Source: {doc.metadata.get('title', 'Unknown')}\n{doc.page_content}"
+            for doc in docs
+        ])
+    
+    def _build_response(self, answer: str, docs: List[Document], relevance_scores: List[float],
+                        domains_consulted: List[BankingDomain]) -> QueryResponse:
+        """Assemble the response for an answer built from the given documents"""
+        # Calculate confidence as the mean relevance of the documents the answer is based on
+        confidence = round(min(1.0, sum(relevance_scores) / len(relevance_scores)), 3)
         
         return QueryResponse(
-            answer=combined_response,
-            sources=[doc.metadata.get('title', 'Unknown') for doc in all_relevant_docs],
+            answer=answer,
+            sources=[doc.metadata.get('title', 'Unknown') for doc in docs],
             confidence=confidence,
             domains_consulted=domains_consulted,
             timestamp=datetime.utcnow()
         )
     
-    def _combine_domain_responses(self, responses: List[Dict], original_query: str) -> str:
-        """Combine responses from multiple domains into a comprehensive answer"""
+    def _no_information_response(self) -> QueryResponse:
+        """Response for queries with no relevant documents in the knowledge base"""
+        return QueryResponse(
+            answer=NO_INFORMATION_ANSWER,
+            sources=[],
+            confidence=0.0,
+            domains_consulted=[],
+            timestamp=datetime.utcnow()
+        )
+    
+    def _unavailable_response(self) -> QueryResponse:
+        """Response for queries that could not be answered because of an error"""
+        return QueryResponse(
+            answer=UNAVAILABLE_ANSWER,
+            sources=[],
+            confidence=0.0,
+            domains_consulted=[],
+            timestamp=datetime.utcnow()
+        )
+    
+    def _llm_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore shared by every query running on the current event loop"""
+        loop = asyncio.get_running_loop()
+        with self._llm_semaphores_lock:
+            semaphore = self._llm_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._llm_semaphores[loop] = asyncio.Semaphore(self.llm_concurrency)
+            return semaphore
+    
+    async def _aask_experts(self, domains: List[BankingDomain], context_text: str,
+                            query: str) -> Tuple[List[Dict], bool]:
+        """Ask each domain's expert concurrently, returning the answers and whether none failed"""
+        expert_domains = [domain for domain in domains if domain in self.domain_chains]
+        semaphore = self._llm_semaphore()
         
-        if len(responses) == 1:
-            return responses[0]["response"]
+        async def ask_expert(domain: BankingDomain):
+            async with semaphore:
+                return await self.domain_chains[domain].ainvoke({
+                    "context": context_text,
+                    "question": query
+                })
         
-        # Create a synthesis prompt
-        synthesis_prompt = PromptTemplate(
-            input_variables=["responses", "question"],
-            template="""
-            You are a banking expert synthesizing information from multiple domain specialists.
-            
-            Original Question: {question}
-            
-            Domain-specific responses:
-            {responses}
-            
-            Please provide a comprehensive, well-structured answer that:
-            1. Addresses the original question completely
-            2. Integrates insights from all relevant domains
-            3. Avoids redundancy while maintaining completeness
-            4. Provides clear, actionable information
-            5. Cites the relevant domains when appropriate
-            
-            Comprehensive Answer:
-            """
-        )
+        tasks = {asyncio.create_task(ask_expert(domain)): domain for domain in expert_domains}
+        pending = set(tasks)
+        responses = []
+        
+        try:
+            # Collect answers as they arrive; a confident expert ends the wait early
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                early_response = None
+                # Check every finished task so none is left with an unretrieved exception
+                for task in done:
+                    domain = tasks[task]
+                    if task.exception() is not None:
+                        logger.error(f"Error generating response for domain {domain}: {task.exception()}")
+                        continue
+                    
+                    confidence, answer = _split_confidence(task.result())
+                    response = {"domain": domain, "response": answer}
+                    if early_response is None and len(expert_domains) > 1 and confidence is not None \
+                            and confidence >= EARLY_ANSWER_CONFIDENCE:
+                        logger.info(f"Answering from {domain.value} alone (confidence {confidence})")
+                        early_response = response
+                    
+                    responses.append(response)
+                
+                if early_response is not None:
+                    return [early_response], True
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        # Keep the requested domain order for synthesis
+        responses.sort(key=lambda resp: expert_domains.index(resp["domain"]))
+        return responses, len(responses) == len(expert_domains)
+    
+    async def _astream_answer(self, expert_domains: List[BankingDomain], responses: Optional[List[Dict]],
+                              context_text: str, query: str) -> AsyncIterator[str]:
+        """Yield the answer in chunks: a lone expert's tokens, or the synthesis of several responses"""
+        # Each streamed call holds a Groq slot until its last token has arrived
+        if responses is None:
+            async with self._llm_semaphore():
+                async for chunk in _astrip_confidence(self.domain_chains[expert_domains[0]].astream({
+                    "context": context_text,
+                    "question": query
+                })):
+                    yield chunk
+            return
         
-        # Format responses for synthesis
-        formatted_responses = "\n\n".join([
+        if len(responses) < 2:
+            yield responses[0]["response"] if responses else UNAVAILABLE_ANSWER
+            return
+        
+        async with self._llm_semaphore():
+            async for chunk in self.synthesis_chain.astream({
+                "responses": self._format_responses(responses),
+                "question": query
+            }):
+                yield chunk
+    
+    def _format_responses(self, responses: List[Dict]) -> str:
+        """Format domain expert responses for synthesis"""
+        return "\n\n".join([
             f"Domain: {resp['domain'].value.replace('_', ' ').title()}\nResponse: {resp['response']}"
             for resp in responses
         ])
+    
+    async def _acombine_domain_responses(self, responses: List[Dict],
+                                         original_query: str) -> Tuple[str, bool]:
+        """Combine responses from multiple domains, returning the answer and whether synthesis succeeded"""
+        
+        if len(responses) == 1:
+            return responses[0]["response"], True
         
         try:
-            chain = LLMChain(llm=self.llm, prompt=synthesis_prompt)
-            combined_response = chain.run({
-                "responses": formatted_responses,
-                "question": original_query
-            })
-            
-            return combined_response
+            async with self._llm_semaphore():
+                combined_response = await self.synthesis_chain.ainvoke({
+                    "responses": self._format_responses(responses),
+                    "question": original_query
+                })
+            return combined_response, True
             
         except Exception as e:
             logger.error(f"Error combining responses: {e}")
             # Fallback to concatenating responses
-            return "\n\n".join([resp["response"] for resp in responses])
+            return "\n\n".join([resp["response"] for resp in responses]), False
     
     def _log_query(self, user_id: str, query: str, response: str, 
                    domains_consulted: List[BankingDomain], confidence: float):
         """Log the query for audit and improvement purposes"""
         try:
-            log_entry = QueryLog(
-                user_id=user_id,
-                query=query,
-                response=response,
-                domains_consulted=json.dumps([d.value for d in domains_consulted]),
-                confidence=str(confidence)
-            )
-            
-            self.db_session.add(log_entry)
-            self.db_session.commit()
+            # The log is append-only, so a Core insert skips the ORM unit of work
+            with self.engine.begin() as conn:
+                conn.execute(insert(QueryLog), [{
+                    "user_id": user_id,
+                    "query": query,
+                    "response": response,
+                    "domains_consulted": orjson.dumps([d.value for d in domains_consulted]).decode(),
+                    "confidence": str(confidence)
+                }])
             
         except Exception as e:
             logger.error(f"Error logging query: {e}")
     
-    def get_knowledge_stats(self) -> Dict[str, Any]:
+    def get_knowledge_stats(self, db: Optional[Session] = None) -> Dict[str, Any]:
         """Get statistics about the knowledge base"""
         try:
-            total_docs = self.db_session.query(DocumentModel).count()
-            
-            domain_stats = {}
-            for domain in BankingDomain:
-                count = self.db_session.query(DocumentModel).filter(
-                    DocumentModel.domain == domain.value
-                ).count()
-                domain_stats[domain.value] = count
+            # Count every domain in one indexed aggregation
+            with self._session(db) as db:
+                counts = dict(
+                    db.query(DocumentModel.domain, func.count())
+                    .group_by(DocumentModel.domain)
+                    .all()
+                )
+            total_docs = sum(counts.values())
+            domain_stats = {domain.value: counts.get(domain.value, 0) for domain in ALL_DOMAINS}
             
+            # All domains share one collection; report how many have indexed documents
             return {
                 "total_documents": total_docs,
                 "domains": domain_stats,
-                "vector_stores_initialized": len(self.vector_stores)
+                "vector_stores_initialized": sum(1 for count in domain_stats.values() if count)
             }
             
         except Exception as e:
@@ -485,7 +1249,8 @@ class VirtualSMESystem:
 app = FastAPI(
     title="Virtual SME Banking Solution",
     description="A comprehensive GenAI solution for banking domain expertise",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -508,9 +1273,18 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     # This is a placeholder - implement proper authentication
     return credentials.credentials
 
+def get_db():
+    """Yield a database session that lives for a single request"""
+    db = virtual_sme.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 @app.post("/query", response_model=QueryResponseModel)
 async def query_knowledge_base(
     request: QueryRequest,
+    background_tasks: BackgroundTasks,
     current_user: str = Depends(get_current_user)
 ):
     """Query the Virtual SME system"""
@@ -520,13 +1294,26 @@ async def query_knowledge_base(
         if request.preferred_domains:
             preferred_domains = [BankingDomain(domain) for domain in request.preferred_domains]
         
-        response = virtual_sme.query_knowledge_base(
+        response = await virtual_sme.aquery_knowledge_base(
             query=request.query,
             user_id=request.user_id,
             preferred_domains=preferred_domains,
-            context=request.context
+            context=request.context,
+            log_query=False
         )
         
+        # Write the audit log after the response is sent; unanswered queries
+        # (no documents found) are not logged, as before
+        if response.domains_consulted:
+            background_tasks.add_task(
+                virtual_sme._log_query,
+                request.user_id,
+                request.query,
+                response.answer,
+                response.domains_consulted,
+                response.confidence
+            )
+        
         return QueryResponseModel(
             answer=response.answer,
             sources=response.sources,
@@ -542,15 +1329,54 @@ async def query_knowledge_base(
             detail="Error processing your query"
         )
 
+@app.post("/query/stream")
+async def stream_knowledge_base(
+    request: QueryRequest,
+    current_user: str = Depends(get_current_user)
+):
+    """Stream the Virtual SME answer as server-sent events"""
+    try:
+        # Convert string domains to enum
+        preferred_domains = None
+        if request.preferred_domains:
+            preferred_domains = [BankingDomain(domain) for domain in request.preferred_domains]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid domain: {e}"
+        )
+    
+    async def events():
+        # Answer text arrives as JSON-encoded "data" events; sources, confidence
+        # and domains follow in a final "metadata" event
+        async for item in virtual_sme.astream_knowledge_base(
+            query=request.query,
+            user_id=request.user_id,
+            preferred_domains=preferred_domains
+        ):
+            if isinstance(item, QueryResponse):
+                metadata = {
+                    "sources": item.sources,
+                    "confidence": item.confidence,
+                    "domains_consulted": [d.value for d in item.domains_consulted],
+                    "timestamp": item.timestamp
+                }
+                yield f"event: metadata\ndata: {orjson.dumps(metadata).decode()}\n\n"
+            else:
+                yield f"data: {orjson.dumps(item).decode()}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 @app.post("/documents")
 async def add_document(
     request: DocumentUploadRequest,
-    current_user: str = Depends(get_current_user)
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """Add a new knowledge document"""
     try:
         document = KnowledgeDocument(
-            id=f"doc_{datetime.utcnow().timestamp()}",
+            id=f"doc_{time.time_ns()}",
             title=request.title,
             content=request.content,
             domain=BankingDomain(request.domain),
@@ -559,7 +1385,7 @@ async def add_document(
             metadata=request.metadata or {}
         )
         
-        success = virtual_sme.add_knowledge_document(document)
+        success = virtual_sme.add_knowledge_document(document, db=db)
         
         if success:
             return {"message": "Document added successfully", "document_id": document.id}
@@ -582,15 +1408,18 @@ async def add_document(
         )
 
 @app.get("/stats")
-async def get_knowledge_stats(current_user: str = Depends(get_current_user)):
+async def get_knowledge_stats(
+    current_user: str = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get knowledge base statistics"""
-    return virtual_sme.get_knowledge_stats()
+    return virtual_sme.get_knowledge_stats(db=db)
 
 @app.get("/domains")
 async def get_available_domains():
     """Get list of available banking domains"""
     return {
-        "domains": [domain.value for domain in BankingDomain],
+        "domains": [domain.value for domain in ALL_DOMAINS],
         "descriptions": {
             BankingDomain.DISTRIBUTION_FINANCE.value: "Supply chain and distribution financing solutions",
             BankingDomain.CHANNEL_FINANCE.value: "Channel partner and dealer financing",